@@ -0,0 +1,23 @@
+"""Persistent on-disk cache shared by the scraper and the LLM extractor."""
+
+import hashlib
+import os
+
+import diskcache
+
+CACHE_DIR = os.getenv("SEASAW_CACHE_DIR", "./cache")
+
+# Scraped pages are considered fresh for a day; after that they are
+# revalidated with ETag / Last-Modified when the server provided them.
+SCRAPE_TTL = 24 * 3600
+
+# How long entries stay on disk at all (stale pages are kept for revalidation)
+RETAIN_TTL = 30 * 24 * 3600
+
+CACHE = diskcache.Cache(CACHE_DIR)
+
+
+def cache_key(prefix: str, *parts: str) -> str:
+    """Build a namespaced key from the sha256 of the given parts."""
+    digest = hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+    return f"{prefix}:{digest}"
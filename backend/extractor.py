@@ -10,7 +10,22 @@ Key design decisions:
 - Broader context extraction (~200 chars) ensures quotes are meaningful
 """
 
+import hashlib
+import os
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import re2  # google-re2: linear-time DFA engine, optional
+except ImportError:
+    re2 = None
+
+try:
+    import ahocorasick  # pyahocorasick: multi-literal scan in C, optional
+except ImportError:
+    ahocorasick = None
 
 # Attribute IDs in display order
 ATTRIBUTE_IDS = [
@@ -30,6 +45,7 @@ ATTRIBUTE_IDS = [
 
 # Each attribute has patterns grouped by severity
 # Patterns are ordered by specificity (most specific first)
+# Patterns must be lowercase — they are matched against lowercased text
 ATTRIBUTE_PATTERNS: dict[str, dict] = {
     "data_selling": {
         "good": [
@@ -93,7 +109,7 @@ ATTRIBUTE_PATTERNS: dict[str, dict] = {
             r"encrypt\w+\s+(at\s+rest|in\s+transit|in\s+storage)",
             r"(data|information)\s+(is|are)\s+encrypt",
             r"(use|implement|employ)\s+encrypt",
-            r"(SSL|TLS|AES|end.to.end)\s+encrypt",
+            r"(ssl|tls|aes|end.to.end)\s+encrypt",
             r"(secure|encrypted)\s+(connection|transmission|communication|storage)",
             r"industry.standard\s+(security|encryption|protection)",
         ],
@@ -248,66 +264,413 @@ ATTRIBUTE_PATTERNS: dict[str, dict] = {
 }
 
 
-def _extract_evidence(text: str, patterns: list[str], context_chars: int = 200) -> str | None:
+def _required_literals(pattern: str) -> frozenset[str]:
     """
-    Find the first matching pattern and return a clean surrounding quote.
-    Extracts ~200 chars of context and tries to snap to sentence boundaries.
+    Return a set of plain substrings such that every match of the pattern
+    contains at least one of them — or an empty set if none can be proven.
+
+    Handles the subset of regex syntax used in ATTRIBUTE_PATTERNS: literal
+    characters, escapes, wildcards, classes, quantifiers and (?:...) groups.
     """
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            start = max(0, match.start() - context_chars // 2)
-            end = min(len(text), match.end() + context_chars // 2)
+    literals, _ = _parse_alternation(pattern, 0)
+    return literals or frozenset()
+
+
+def _parse_alternation(pattern: str, i: int) -> tuple[frozenset[str] | None, int]:
+    """Parse branches up to a closing ")" or the end; return (literals, index)."""
+    branches = []
+    while True:
+        literals, i = _parse_sequence(pattern, i)
+        branches.append(literals)
+        if i < len(pattern) and pattern[i] == "|":
+            i += 1
+            continue
+        break
+    if any(b is None for b in branches):
+        return None, i
+    return frozenset().union(*branches), i
+
+
+def _parse_sequence(pattern: str, i: int) -> tuple[frozenset[str] | None, int]:
+    """Parse one branch and return the most selective literal set it requires."""
+    candidates = []
+    run = ""
+    while i < len(pattern) and pattern[i] not in "|)":
+        c = pattern[i]
+        literal = None
+        group = None
+        if c == "\\":
+            i += 2
+        elif c == "[":
+            i = pattern.index("]", i + 2) + 1
+        elif c == "(":
+            if pattern.startswith("(?:", i):
+                group, i = _parse_alternation(pattern, i + 3)
+            elif pattern.startswith("(?", i):
+                return None, len(pattern)  # lookarounds etc. are not supported
+            else:
+                group, i = _parse_alternation(pattern, i + 1)
+            i += 1  # closing ")"
+        elif c in ".^$":
+            i += 1
+        else:
+            literal = c
+            i += 1
+
+        quantified = optional = False
+        if i < len(pattern) and pattern[i] in "?*+{":
+            quantified = True
+            optional = pattern[i] in "?*" or (pattern[i] == "{" and pattern[i + 1] in "0,")
+            i = pattern.index("}", i) + 1 if pattern[i] == "{" else i + 1
+            if i < len(pattern) and pattern[i] == "?":
+                i += 1  # lazy quantifier
+
+        if literal is not None and not quantified:
+            run += literal
+            continue
+        # Anything but a plain literal character ends the current run
+        if literal is not None and not optional:
+            run += literal
+        if run:
+            candidates.append(frozenset({run}))
+            run = ""
+        if group and not optional:
+            candidates.append(group)
+    if run:
+        candidates.append(frozenset({run}))
+    if not candidates:
+        return None, i
+    # Prefer the set whose shortest literal is longest, then the smallest set
+    return max(candidates, key=lambda s: (min(map(len, s)), -len(s))), i
+
+
+# An unescaped "(" that does not already start a (?...) construct
+_CAPTURING_GROUP_RE = re.compile(r"(?<!\\)\((?!\?)")
+
+
+def _non_capturing(pattern: str) -> str:
+    """
+    Rewrite capturing groups as (?:...). Only match spans are ever used, and
+    sre emits no MARK bookkeeping for non-capturing groups, which keeps the
+    compiled programs smaller and the backtracking cheaper.
+    """
+    return _CAPTURING_GROUP_RE.sub("(?:", pattern)
+
+
+# A compiled pattern paired with the literals one of which any match contains
+_CompiledPattern = tuple[frozenset[str], re.Pattern]
+
+
+# RE2's \w and \d are ASCII-only; spell out the Unicode classes sre uses
+# (str.isalnum() plus "_", and decimal digits). None of the patterns use
+# these escapes inside [...], where the bracketed forms would not nest.
+_RE2_CLASSES = {r"\w": r"[\p{L}\p{N}_]", r"\d": r"\p{Nd}"}
+_ESCAPE_RE = re.compile(r"\\.")
+
+
+def _re2_syntax(pattern: str) -> str:
+    """Rewrite a pattern so RE2 matches the same characters as sre."""
+    return _ESCAPE_RE.sub(lambda m: _RE2_CLASSES.get(m.group(), m.group()), pattern)
+
+
+def _compile(pattern: str) -> re.Pattern:
+    """
+    Compile with RE2 when it is installed — its DFA runs in linear time with
+    no backtracking — and with the stdlib engine otherwise, or for any
+    pattern RE2 rejects.
+    """
+    if re2 is not None:
+        try:
+            return re2.compile(_re2_syntax(pattern))
+        except re2.error:
+            pass
+    return re.compile(pattern)
 
-            snippet = text[start:end]
 
-            # Snap to sentence start
-            sentence_start = snippet.find(". ")
-            if sentence_start != -1 and sentence_start < context_chars // 3:
-                snippet = snippet[sentence_start + 2:]
+# Compiled once at import — same shape as ATTRIBUTE_PATTERNS, with each
+# pattern paired with the literals one of which any match must contain.
+# Patterns are searched one at a time rather than fused into a single
+# alternation per bucket: sre has no first-character prefilter for a branch
+# of groups, so a fused scan tries every alternative at every offset and
+# benchmarks slower than the separate searches it replaces.
+_COMPILED_PATTERNS: dict[str, dict[str, tuple[_CompiledPattern, ...]]] = {
+    attr_id: {
+        severity: tuple((_required_literals(p), _compile(_non_capturing(p))) for p in patterns)
+        for severity, patterns in buckets.items()
+    }
+    for attr_id, buckets in ATTRIBUTE_PATTERNS.items()
+}
+
+# Attributes where a negation like "do not sell" beats any bad match
+_GOOD_PRIORITY_ATTRIBUTES = frozenset({"data_selling", "data_sharing", "third_party_tracking"})
+
+# RE2's \s only covers ASCII whitespace — non-ASCII spaces (e.g. the
+# non-breaking spaces common in scraped HTML) are mapped to " " so both
+# engines see the same text
+_UNICODE_SPACES = {
+    i: " " for i in range(0x3001) if chr(i).isspace() and chr(i) not in "\t\n\f\r "
+}
+
+
+# Characters IGNORECASE matches against an ASCII letter that str.lower()
+# leaves alone ("ı", "ſ") or expands to two codepoints ("İ", the only one)
+_ASCII_FOLDS = {0x130: "i", 0x131: "i", 0x17F: "s"}
+
+
+def _lowercase(text: str) -> str:
+    """
+    Lowercase text for matching while keeping every index aligned with the
+    original, so match spans can slice quotes out of the original casing.
+    """
+    lowered = text.translate(_ASCII_FOLDS).lower()
+    if re2 is not None:
+        lowered = lowered.translate(_UNICODE_SPACES)
+    return lowered
+
+
+# Every distinct prefilter literal across all patterns
+_LITERALS = frozenset(
+    literal
+    for buckets in _COMPILED_PATTERNS.values()
+    for patterns in buckets.values()
+    for literals, _ in patterns
+    for literal in literals
+)
+
+
+def _build_literal_automaton():
+    """Aho-Corasick automaton over _LITERALS, or None without pyahocorasick."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for literal in _LITERALS:
+        automaton.add_word(literal, literal)
+    automaton.make_automaton()
+    return automaton
 
-            # Snap to sentence end
-            last_period = snippet.rfind(".")
-            if last_period != -1 and last_period > len(snippet) * 0.6:
-                snippet = snippet[:last_period + 1]
 
-            # Clean whitespace
-            snippet = re.sub(r"\s+", " ", snippet).strip()
+_LITERAL_AUTOMATON = _build_literal_automaton()
 
-            if len(snippet) > 20:
-                return f'"{snippet}"'
-            return snippet if snippet else None
+
+class _LiteralPresence(dict):
+    """
+    Memoized `literal in text` for one text. Many literals ("data",
+    "account", "encrypt", ...) are shared by several patterns, so each
+    distinct literal is scanned for at most once per text.
+
+    With pyahocorasick installed, all literals are found up front in a
+    single pass over the text instead.
+    """
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str) -> None:
+        super().__init__()
+        self.text = text
+        if _LITERAL_AUTOMATON is not None:
+            self.update(dict.fromkeys(_LITERALS, False))
+            for _, literal in _LITERAL_AUTOMATON.iter(text):
+                self[literal] = True
+
+    def __missing__(self, literal: str) -> bool:
+        found = self[literal] = literal in self.text
+        return found
+
+
+def _first_match(
+    text: str, patterns: tuple[_CompiledPattern, ...], present: _LiteralPresence
+) -> tuple[int, int] | None:
+    """
+    Return the span of the first pattern (in list order) found in the text.
+    A pattern whose required literals are all absent cannot match, so the
+    cheap substring checks let most regex searches be skipped outright.
+    """
+    for literals, pattern in patterns:
+        if literals and not any(present[literal] for literal in literals):
+            continue
+        match = pattern.search(text)
+        if match:
+            return match.span()
     return None
 
 
-def _get_context_evidence(text: str, attr_id: str) -> str:
+def _quote_span(text: str, span: tuple[int, int], context_chars: int = 200) -> str | None:
+    """
+    Turn a match span into a clean surrounding quote.
+    Extracts ~200 chars of context and tries to snap to sentence boundaries.
+    """
+    start = max(0, span[0] - context_chars // 2)
+    end = min(len(text), span[1] + context_chars // 2)
+
+    # Boundaries are searched in place on the full text, bounded to the
+    # window, so only the final quote is ever sliced out
+
+    # Snap to sentence start
+    sentence_start = text.find(". ", start, min(end, start + context_chars // 3 + 1))
+    if sentence_start != -1:
+        start = sentence_start + 2
+
+    # Snap to sentence end
+    last_period = text.rfind(".", start, end)
+    if last_period != -1 and last_period - start > (end - start) * 0.6:
+        end = last_period + 1
+
+    snippet = text[start:end]
+
+    # Clean whitespace
+    snippet = " ".join(snippet.split())
+
+    if len(snippet) > 20:
+        return f'"{snippet}"'
+    return snippet if snippet else None
+
+
+def _extract_evidence(
+    text: str,
+    text_lc: str,
+    present: _LiteralPresence,
+    patterns: tuple[_CompiledPattern, ...],
+    context_chars: int = 200,
+) -> str | None:
+    """
+    Find the first matching pattern in the lowercased text and return a clean
+    surrounding quote from the original text.
+    """
+    span = _first_match(text_lc, patterns, present)
+    if span is None:
+        return None
+    return _quote_span(text, span, context_chars)
+
+
+# Neutral-attribute explanations used when no related text is found
+_CONTEXT_FALLBACKS: dict[str, str] = {
+    "data_selling": "The policy does not contain explicit language about selling or not selling user data to third parties. This could indicate the company avoids directly addressing this practice.",
+    "data_sharing": "The policy does not clearly state its data sharing practices with third-party partners or affiliates.",
+    "account_deletion": "The policy does not explicitly describe a process for users to delete their accounts or request data erasure. Users may need to contact support directly.",
+    "encryption": "The policy does not mention encryption, SSL/TLS, or specific data security measures. This does not necessarily mean data is unprotected, but transparency is lacking.",
+    "data_retention": "The policy does not specify how long user data is retained or what happens to data after account closure.",
+    "third_party_tracking": "The policy does not explicitly address the use of third-party tracking technologies, cookies, or analytics tools.",
+    "government_requests": "The policy does not describe its process for handling government or law enforcement data requests, or whether users are notified.",
+    "arbitration_clause": "The policy does not contain a mandatory arbitration clause. Disputes may be handled through standard legal channels.",
+    "class_action_waiver": "The policy does not explicitly waive or preserve users' rights to participate in class-action lawsuits.",
+    "unilateral_changes": "The policy does not clearly state how changes to terms are communicated to users or how much notice is given.",
+    "liability_limitation": "The policy does not contain explicit liability limitations or warranty disclaimers.",
+    "content_license": "The policy does not clearly address what rights the company claims over user-generated content.",
+}
+
+
+def _get_fallback_evidence(attr_id: str) -> str:
+    """Explanation for a neutral attribute with no related text at all."""
+    return _CONTEXT_FALLBACKS.get(attr_id, "This attribute was not explicitly addressed in the analyzed policy text.")
+
+
+def _get_context_evidence(
+    text: str,
+    text_lc: str,
+    present: _LiteralPresence,
+    context_patterns: tuple[_CompiledPattern, ...],
+    fallback: str,
+) -> str:
     """
     For neutral attributes — search for ANY related mentions in the text
     and build a reasoned explanation of why it's unclear.
     """
-    patterns = ATTRIBUTE_PATTERNS.get(attr_id, {})
-    context_patterns = patterns.get("context", [])
-
-    evidence = _extract_evidence(text, context_patterns, context_chars=250)
+    evidence = _extract_evidence(text, text_lc, present, context_patterns, context_chars=250)
     if evidence:
         return f"The policy mentions related topics but does not clearly address this: {evidence}"
 
     # Fallback: describe what we looked for
-    descriptions = {
-        "data_selling": "The policy does not contain explicit language about selling or not selling user data to third parties. This could indicate the company avoids directly addressing this practice.",
-        "data_sharing": "The policy does not clearly state its data sharing practices with third-party partners or affiliates.",
-        "account_deletion": "The policy does not explicitly describe a process for users to delete their accounts or request data erasure. Users may need to contact support directly.",
-        "encryption": "The policy does not mention encryption, SSL/TLS, or specific data security measures. This does not necessarily mean data is unprotected, but transparency is lacking.",
-        "data_retention": "The policy does not specify how long user data is retained or what happens to data after account closure.",
-        "third_party_tracking": "The policy does not explicitly address the use of third-party tracking technologies, cookies, or analytics tools.",
-        "government_requests": "The policy does not describe its process for handling government or law enforcement data requests, or whether users are notified.",
-        "arbitration_clause": "The policy does not contain a mandatory arbitration clause. Disputes may be handled through standard legal channels.",
-        "class_action_waiver": "The policy does not explicitly waive or preserve users' rights to participate in class-action lawsuits.",
-        "unilateral_changes": "The policy does not clearly state how changes to terms are communicated to users or how much notice is given.",
-        "liability_limitation": "The policy does not contain explicit liability limitations or warranty disclaimers.",
-        "content_license": "The policy does not clearly address what rights the company claims over user-generated content.",
+    return fallback
+
+
+# Human-readable 'good' values per attribute
+_GOOD_VALUES: dict[str, str] = {
+    "data_selling": "No — does not sell personal data",
+    "data_sharing": "Limited or no third-party data sharing",
+    "account_deletion": "Yes — users can delete their account and data",
+    "encryption": "Yes — data is encrypted",
+    "data_retention": "Limited retention period specified",
+    "third_party_tracking": "No third-party tracking",
+    "government_requests": "Users are notified of government data requests",
+    "arbitration_clause": "No mandatory arbitration",
+    "class_action_waiver": "Class-action rights preserved",
+    "unilateral_changes": "Advance notice provided before changes",
+    "liability_limitation": "Full liability accepted",
+    "content_license": "Users retain full content ownership",
+}
+
+
+def _get_good_value(attr_id: str) -> str:
+    """Human-readable 'good' value for an attribute."""
+    return _GOOD_VALUES.get(attr_id, "User-friendly")
+
+
+# Human-readable 'bad' values per attribute
+_BAD_VALUES: dict[str, str] = {
+    "data_selling": "Yes — may sell or share data with advertisers",
+    "data_sharing": "Shares data with third parties and affiliates",
+    "account_deletion": "No clear account deletion option",
+    "encryption": "No encryption practices mentioned",
+    "data_retention": "Data retained indefinitely or long-term",
+    "third_party_tracking": "Uses third-party trackers and cookies",
+    "government_requests": "Complies with requests without notifying users",
+    "arbitration_clause": "Mandatory binding arbitration required",
+    "class_action_waiver": "Class-action lawsuit rights waived",
+    "unilateral_changes": "Can change terms without prior notice",
+    "liability_limitation": "Liability is capped or broadly excluded",
+    "content_license": "Claims broad license to your content",
+}
+
+
+def _get_bad_value(attr_id: str) -> str:
+    """Human-readable 'bad' value for an attribute."""
+    return _BAD_VALUES.get(attr_id, "User-hostile")
+
+
+# No pattern can match text shorter than its shortest required literal
+_MIN_PATTERN_LITERAL_LEN = min(
+    min(map(len, literals), default=1)
+    for buckets in _COMPILED_PATTERNS.values()
+    for patterns in buckets.values()
+    for literals, _ in patterns
+)
+
+# Result for text too short to match anything — every attribute neutral
+_ALL_NEUTRAL_RESULT = tuple(
+    {
+        "id": attr_id,
+        "value": "Not clearly addressed",
+        "severity": "neutral",
+        "evidence": _get_fallback_evidence(attr_id),
     }
-    return descriptions.get(attr_id, "This attribute was not explicitly addressed in the analyzed policy text.")
+    for attr_id in ATTRIBUTE_IDS
+)
+
+
+# Flat per-attribute rows in display order for the hot loop:
+# (attr_id, good, bad, context, good_priority, good_value, bad_value, fallback)
+# — no dict lookups per attribute, and a shape mypyc/Cython can type
+# without dict[str, dict[str, list]]
+_ATTR_TABLE = tuple(
+    (
+        attr_id,
+        _COMPILED_PATTERNS[attr_id].get("good", ()),
+        _COMPILED_PATTERNS[attr_id].get("bad", ()),
+        _COMPILED_PATTERNS[attr_id].get("context", ()),
+        attr_id in _GOOD_PRIORITY_ATTRIBUTES,
+        _get_good_value(attr_id),
+        _get_bad_value(attr_id),
+        _get_fallback_evidence(attr_id),
+    )
+    for attr_id in ATTRIBUTE_IDS
+)
+
+
+# Results for recently analyzed texts, keyed by a digest of the text so the
+# cache never holds on to the (large) policy strings themselves
+RESULT_CACHE_SIZE = 256
+_RESULT_CACHE: OrderedDict[bytes, tuple[dict, ...]] = OrderedDict()
+_RESULT_CACHE_LOCK = threading.Lock()
 
 
 def extract_attributes_heuristic(text: str) -> list[dict]:
@@ -317,16 +680,45 @@ def extract_attributes_heuristic(text: str) -> list[dict]:
 
     Every attribute will ALWAYS have meaningful evidence — either a direct
     quote from the policy or a reasoned explanation.
+
+    Policies rarely change, so results are memoized per text (LRU of
+    RESULT_CACHE_SIZE entries); callers always get fresh dicts.
     """
-    results = []
+    if len(text) < _MIN_PATTERN_LITERAL_LEN:
+        return [dict(attr) for attr in _ALL_NEUTRAL_RESULT]
+
+    key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    with _RESULT_CACHE_LOCK:
+        cached = _RESULT_CACHE.get(key)
+        if cached is not None:
+            _RESULT_CACHE.move_to_end(key)
+    if cached is None:
+        cached = tuple(_extract_attributes(text))
+        with _RESULT_CACHE_LOCK:
+            _RESULT_CACHE[key] = cached
+            if len(_RESULT_CACHE) > RESULT_CACHE_SIZE:
+                _RESULT_CACHE.popitem(last=False)
 
-    for attr_id in ATTRIBUTE_IDS:
-        patterns = ATTRIBUTE_PATTERNS.get(attr_id, {})
-        good_patterns = patterns.get("good", [])
-        bad_patterns = patterns.get("bad", [])
+    return [dict(attr) for attr in cached]
 
-        good_evidence = _extract_evidence(text, good_patterns)
-        bad_evidence = _extract_evidence(text, bad_patterns)
+
+def _extract_attributes(text: str) -> list[dict]:
+    """Uncached heuristic extraction behind extract_attributes_heuristic."""
+    results = []
+    text_lc = _lowercase(text)
+    present = _LiteralPresence(text_lc)
+
+    for (
+        attr_id, good_patterns, bad_patterns, context_patterns,
+        good_priority, good_value, bad_value, fallback,
+    ) in _ATTR_TABLE:
+        bad_evidence = _extract_evidence(text, text_lc, present, bad_patterns)
+        # A bad match settles every other attribute on its own, so their
+        # good patterns only need scanning when nothing bad was found
+        if bad_evidence and not good_priority:
+            good_evidence = None
+        else:
+            good_evidence = _extract_evidence(text, text_lc, present, good_patterns)
 
         # Determine severity with priority logic:
         # 1. If BOTH good and bad are found → check which is more specific
@@ -337,27 +729,27 @@ def extract_attributes_heuristic(text: str) -> list[dict]:
         if good_evidence and bad_evidence:
             # Both found — for most attributes, bad overrides good
             # EXCEPT: negation patterns (like "do not sell") should win
-            if attr_id in ("data_selling", "data_sharing", "third_party_tracking"):
+            if good_priority:
                 # These often have "do not share/sell" which should override
                 severity = "good"
-                value = _get_good_value(attr_id)
+                value = good_value
                 evidence = f"Policy states: {good_evidence} — However, it also mentions: {bad_evidence}"
             else:
                 severity = "bad"
-                value = _get_bad_value(attr_id)
-                evidence = f"Policy states: {bad_evidence}"
+                value = bad_value
+                evidence = "Policy states: " + bad_evidence
         elif good_evidence:
             severity = "good"
-            value = _get_good_value(attr_id)
-            evidence = f"Policy states: {good_evidence}"
+            value = good_value
+            evidence = "Policy states: " + good_evidence
         elif bad_evidence:
             severity = "bad"
-            value = _get_bad_value(attr_id)
-            evidence = f"Policy states: {bad_evidence}"
+            value = bad_value
+            evidence = "Policy states: " + bad_evidence
         else:
             severity = "neutral"
             value = "Not clearly addressed"
-            evidence = _get_context_evidence(text, attr_id)
+            evidence = _get_context_evidence(text, text_lc, present, context_patterns, fallback)
 
         results.append({
             "id": attr_id,
@@ -369,39 +761,27 @@ def extract_attributes_heuristic(text: str) -> list[dict]:
     return results
 
 
-def _get_good_value(attr_id: str) -> str:
-    """Human-readable 'good' value for an attribute."""
-    values = {
-        "data_selling": "No — does not sell personal data",
-        "data_sharing": "Limited or no third-party data sharing",
-        "account_deletion": "Yes — users can delete their account and data",
-        "encryption": "Yes — data is encrypted",
-        "data_retention": "Limited retention period specified",
-        "third_party_tracking": "No third-party tracking",
-        "government_requests": "Users are notified of government data requests",
-        "arbitration_clause": "No mandatory arbitration",
-        "class_action_waiver": "Class-action rights preserved",
-        "unilateral_changes": "Advance notice provided before changes",
-        "liability_limitation": "Full liability accepted",
-        "content_license": "Users retain full content ownership",
-    }
-    return values.get(attr_id, "User-friendly")
+# Batches larger than this are spread across worker processes
+PARALLEL_BATCH_THRESHOLD = 8
 
 
-def _get_bad_value(attr_id: str) -> str:
-    """Human-readable 'bad' value for an attribute."""
-    values = {
-        "data_selling": "Yes — may sell or share data with advertisers",
-        "data_sharing": "Shares data with third parties and affiliates",
-        "account_deletion": "No clear account deletion option",
-        "encryption": "No encryption practices mentioned",
-        "data_retention": "Data retained indefinitely or long-term",
-        "third_party_tracking": "Uses third-party trackers and cookies",
-        "government_requests": "Complies with requests without notifying users",
-        "arbitration_clause": "Mandatory binding arbitration required",
-        "class_action_waiver": "Class-action lawsuit rights waived",
-        "unilateral_changes": "Can change terms without prior notice",
-        "liability_limitation": "Liability is capped or broadly excluded",
-        "content_license": "Claims broad license to your content",
-    }
-    return values.get(attr_id, "User-hostile")
+def extract_attributes_heuristic_batch(
+    texts: list[str], max_workers: int | None = None
+) -> list[list[dict]]:
+    """
+    Extract policy attributes from many texts at once.
+    Returns one attribute list per text, in input order.
+
+    All pattern compilation and table setup happens once at import (once
+    per worker process), so a batch only pays the per-text matching work.
+    Batches above PARALLEL_BATCH_THRESHOLD run in a process pool — each
+    text is independent, and regex matching holds the GIL.
+    """
+    extract = extract_attributes_heuristic
+    if len(texts) <= PARALLEL_BATCH_THRESHOLD:
+        return [extract(text) for text in texts]
+
+    workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(texts) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(extract, texts, chunksize=chunksize))
@@ -2,6 +2,9 @@
 This avoids needing an LLM just to find well-known URLs.
 """
 
+from collections.abc import Mapping
+from types import MappingProxyType
+
 KNOWN_SERVICES: dict[str, dict] = {
     "netflix": {
         "service_name": "Netflix",
@@ -132,14 +135,41 @@ KNOWN_SERVICES: dict[str, dict] = {
 }
 
 
-def lookup_service(query: str) -> dict | None:
-    """Look up a service by name. Returns service info dict or None."""
+# Read-only views handed out by lookup_service — shared, so never copied
+_SERVICE_VIEWS: dict[str, Mapping[str, str]] = {
+    key: MappingProxyType(info) for key, info in KNOWN_SERVICES.items()
+}
+
+_SERVICE_KEYS = tuple(KNOWN_SERVICES)
+
+
+def _build_substring_index() -> dict[str, str]:
+    """Map every substring of every key to the first key (in table order) containing it."""
+    index: dict[str, str] = {}
+    for key in _SERVICE_KEYS:
+        for start in range(len(key) + 1):
+            for end in range(start, len(key) + 1):
+                index.setdefault(key[start:end], key)
+    return index
+
+
+_SUBSTRING_INDEX = _build_substring_index()
+
+
+def lookup_service(query: str) -> Mapping[str, str] | None:
+    """
+    Look up a service by name. Returns a read-only service info mapping or
+    None — call dict() on it if a mutable copy is needed.
+    """
     key = query.strip().lower()
     # Direct match
-    if key in KNOWN_SERVICES:
-        return KNOWN_SERVICES[key].copy()
-    # Partial match
-    for k, v in KNOWN_SERVICES.items():
-        if key in k or k in key:
-            return v.copy()
-    return None
+    if key in _SERVICE_VIEWS:
+        return _SERVICE_VIEWS[key]
+    # Partial match — query is part of a name ("net"), one dict lookup
+    match = _SUBSTRING_INDEX.get(key)
+    if match is None:
+        # ...or a name is part of the query ("netflix app")
+        match = next((k for k in _SERVICE_KEYS if k in key), None)
+    if match is None:
+        return None
+    return _SERVICE_VIEWS[match]
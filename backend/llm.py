@@ -1,18 +1,32 @@
 """Ollama LLM client — service resolution + policy attribute extraction."""
 
-import json
 import logging
 import os
 import re
 from typing import Any
 
 import ollama as ollama_lib
+import orjson
+
+from cache import CACHE, RETAIN_TTL, cache_key
 
 logger = logging.getLogger(__name__)
 
 OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.2:3b")
 
+# Context window requested from Ollama. Its default (often 2048) silently
+# truncates the policy text. Every call uses the same value, since a
+# different num_ctx makes Ollama reload the model.
+OLLAMA_NUM_CTX = int(os.getenv("OLLAMA_NUM_CTX", "16384"))
+OLLAMA_NUM_BATCH = 512
+
+# Tokens reserved for the extraction output
+EXTRACT_NUM_PREDICT = 2000
+
+# Rough chars-per-token for English legal text
+_CHARS_PER_TOKEN = 3.5
+
 # Attribute IDs we expect from the extraction prompt
 EXPECTED_ATTRIBUTES = [
     "data_selling",
@@ -28,11 +42,87 @@ EXPECTED_ATTRIBUTES = [
     "liability_limitation",
     "content_license",
 ]
+_EXPECTED_SET = frozenset(EXPECTED_ATTRIBUTES)
+
+# Attributes normally settled by the terms of service; the rest are
+# privacy-policy matters. Used to merge per-page extractions.
+_TERMS_ATTRIBUTES = frozenset({
+    "arbitration_clause",
+    "class_action_waiver",
+    "unilateral_changes",
+    "liability_limitation",
+    "content_license",
+})
+
+# Static instructions go in the system message so the prompt prefix is
+# byte-identical across calls and Ollama can reuse its KV cache for it
+_EXTRACTOR_SYSTEM = """Analyze this Terms of Service / Privacy Policy text.
+Return ONLY a JSON array (no prose, no markdown fences) with one object per ID:
+{"id": ID, "value": short factual answer (e.g. "Yes", "No", "30 days"), "severity": "good"|"neutral"|"bad", "evidence": one sentence quoted or paraphrased from the text}
+Severity: good = user-friendly, bad = user-hostile, neutral = ambiguous or industry standard.
+IDs:
+data_selling: sells user data to third parties?
+data_sharing: shares data with affiliates/partners beyond what's needed?
+account_deletion: users can fully delete their account and data?
+encryption: data encrypted at rest and in transit?
+data_retention: how long data is kept after account deletion?
+third_party_tracking: third-party trackers/analytics/ad cookies used?
+government_requests: complies with government data requests without notifying users?
+arbitration_clause: mandatory arbitration?
+class_action_waiver: user waives class-action rights?
+unilateral_changes: terms can change without prior notice?
+liability_limitation: liability capped or broadly excluded?
+content_license: broad license to user-generated content?"""
+
+_RESOLVE_SYSTEM = """Identify the online service the user query refers to and give its official Terms of Service and Privacy Policy URLs.
+
+Return ONLY valid JSON with no additional text:
+{
+  "service_name": "Official Service Name",
+  "domain": "example.com",
+  "terms_url": "https://example.com/terms",
+  "privacy_url": "https://example.com/privacy"
+}
+
+Rules:
+- Use the most well-known official domain
+- URLs must be full https:// URLs to the actual legal pages
+- If you're unsure of exact URLs, use your best knowledge of where major services host their legal pages
+- Do NOT wrap in markdown, do NOT add explanations"""
+
+# Policy text budget: context minus output reserve, less the instructions
+# and a little slack for the prompt template and truncation marker
+_EXTRACT_MAX_CHARS = (
+    int((OLLAMA_NUM_CTX - EXTRACT_NUM_PREDICT) * _CHARS_PER_TOKEN)
+    - len(_EXTRACTOR_SYSTEM)
+    - 64
+)
+
+# Below this there is no point sending a policy at all (and a negative
+# budget would turn the truncating slice into "drop the last N chars")
+_MIN_EXTRACT_CHARS = 4000
+if _EXTRACT_MAX_CHARS < _MIN_EXTRACT_CHARS:
+    raise ValueError(
+        f"OLLAMA_NUM_CTX={OLLAMA_NUM_CTX} leaves only {_EXTRACT_MAX_CHARS} chars for policy "
+        f"text after the prompt and {EXTRACT_NUM_PREDICT} output tokens; use 4096 or more"
+    )
+
+
+# Patterns used to clean up LLM output, compiled once
+_FENCE_OPEN = re.compile(r"```(?:json)?\s*")
+_FENCE_CLOSE = re.compile(r"```\s*$")
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+# Shared client — reuses one HTTP connection pool across all LLM calls
+_CLIENT: ollama_lib.Client | None = None
 
 
 def _get_client() -> ollama_lib.Client:
-    """Create an Ollama client pointed at the configured host."""
-    return ollama_lib.Client(host=OLLAMA_HOST)
+    """Return the shared Ollama client, creating it on first use."""
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = ollama_lib.Client(host=OLLAMA_HOST)
+    return _CLIENT
 
 
 def _repair_json(raw: str) -> str:
@@ -41,8 +131,8 @@ def _repair_json(raw: str) -> str:
     Handles: markdown fences, trailing commas, unquoted keys, etc.
     """
     # Strip markdown fences
-    raw = re.sub(r"```(?:json)?\s*", "", raw)
-    raw = re.sub(r"```\s*$", "", raw)
+    raw = _FENCE_OPEN.sub("", raw)
+    raw = _FENCE_CLOSE.sub("", raw)
     raw = raw.strip()
 
     # Find the first { or [ and last } or ]
@@ -63,25 +153,115 @@ def _repair_json(raw: str) -> str:
     candidate = raw[start:end]
 
     # Remove trailing commas before } or ]
-    candidate = re.sub(r",\s*([}\]])", r"\1", candidate)
+    candidate = _TRAILING_COMMA.sub(r"\1", candidate)
 
     return candidate
 
 
+class _SpanScanner:
+    """
+    Bracket-balance scanner that can be fed a growing string.
+    Tracks depth while ignoring brackets inside string literals, and picks
+    up where the previous feed() stopped, so streamed output is scanned once.
+    """
+
+    def __init__(self) -> None:
+        self.pos = 0
+        self.start = -1
+        self.depth = 0
+        self.in_str = False
+        self.escaped = False
+
+    def feed(self, s: str) -> tuple[int, int] | None:
+        """Scan s past the last position; return (start, end) when a block closes."""
+        start, depth = self.start, self.depth
+        in_str, escaped = self.in_str, self.escaped
+        span = None
+
+        i = self.pos
+        while i < len(s):
+            ch = s[i]
+            i += 1
+            if in_str:
+                if escaped:
+                    escaped = False
+                elif ch == "\\":
+                    escaped = True
+                elif ch == '"':
+                    in_str = False
+            elif ch == '"':
+                if depth:
+                    in_str = True
+            elif ch in "{[":
+                if depth == 0:
+                    start = i - 1
+                depth += 1
+            elif ch in "}]" and depth:
+                depth -= 1
+                if depth == 0:
+                    span = (start, i)
+                    break
+
+        self.pos = i
+        self.start, self.depth = start, depth
+        self.in_str, self.escaped = in_str, escaped
+        return span
+
+
+def _first_valid_json(s: str) -> Any:
+    """
+    Parse the first balanced {...} or [...] block in s that is valid JSON
+    (after dropping trailing commas), resuming the scan after each block
+    that fails. Only top-level blocks are tried, so one element of a
+    malformed array is never mistaken for the whole answer. Raises
+    ValueError if no block parses.
+    """
+    scanner = _SpanScanner()
+    while span := scanner.feed(s):
+        block = s[span[0]:span[1]]
+        for candidate in (block, _TRAILING_COMMA.sub(r"\1", block)):
+            try:
+                return orjson.loads(candidate)
+            except orjson.JSONDecodeError:
+                pass
+    raise ValueError("No balanced JSON block parses")
+
+
+def _complete_attributes(candidate: str) -> Any:
+    """
+    Parse a balanced block from streamed output if it already holds the
+    attribute list (a list, or a dict wrapping one). Returns None otherwise.
+    """
+    try:
+        parsed = orjson.loads(candidate)
+    except orjson.JSONDecodeError:
+        return None
+    if isinstance(parsed, list):
+        return parsed
+    if isinstance(parsed, dict) and any(isinstance(v, list) for v in parsed.values()):
+        return parsed
+    return None
+
+
 def _parse_json(raw: str) -> Any:
     """Parse JSON from LLM output with repair attempts."""
+    # Fast path — the prompts ask for bare JSON, which is the common case
+    try:
+        return orjson.loads(raw.strip())
+    except orjson.JSONDecodeError:
+        pass
+
     repaired = _repair_json(raw)
     try:
-        return json.loads(repaired)
-    except json.JSONDecodeError:
-        # Last resort: try to find any JSON-like structure
-        match = re.search(r'[{\[].*[}\]]', repaired, re.DOTALL)
-        if match:
-            try:
-                return json.loads(match.group())
-            except json.JSONDecodeError:
-                pass
-        raise ValueError(f"Could not parse LLM output as JSON: {repaired[:200]}...")
+        return orjson.loads(repaired)
+    except orjson.JSONDecodeError:
+        pass
+    # Last resort: the first block that parses. Scans the unrepaired text,
+    # since _repair_json's first-to-last bracket cut can clip a valid block
+    try:
+        return _first_valid_json(raw)
+    except ValueError:
+        raise ValueError(f"Could not parse LLM output as JSON: {repaired[:200]}...") from None
 
 
 def resolve_service(query: str, retries: int = 2) -> dict:
@@ -92,38 +272,36 @@ def resolve_service(query: str, retries: int = 2) -> dict:
     """
     client = _get_client()
 
-    prompt = f"""Given the user query "{query}", identify the online service they mean and find the official Terms of Service and Privacy Policy URLs.
-
-Return ONLY valid JSON with no additional text:
-{{
-  "service_name": "Official Service Name",
-  "domain": "example.com",
-  "terms_url": "https://example.com/terms",
-  "privacy_url": "https://example.com/privacy"
-}}
-
-Rules:
-- Use the most well-known official domain
-- URLs must be full https:// URLs to the actual legal pages
-- If you're unsure of exact URLs, use your best knowledge of where major services host their legal pages
-- Do NOT wrap in markdown, do NOT add explanations"""
+    prompt = f'User query: "{query}"'
 
     last_error = None
     for attempt in range(retries + 1):
         try:
             response = client.chat(
                 model=OLLAMA_MODEL,
-                messages=[{"role": "user", "content": prompt}],
-                options={"temperature": 0.1, "num_predict": 300},
+                messages=[
+                    {"role": "system", "content": _RESOLVE_SYSTEM},
+                    {"role": "user", "content": prompt},
+                ],
+                options={
+                    "temperature": 0.1,
+                    "num_predict": 300,
+                    "num_ctx": OLLAMA_NUM_CTX,
+                    "num_batch": OLLAMA_NUM_BATCH,
+                },
             )
             content = response["message"]["content"]
             logger.info(f"Resolve attempt {attempt + 1}: {content[:200]}")
             result = _parse_json(content)
 
-            # Validate required keys
+            # Validate required keys; they go to the client as strings
+            if not isinstance(result, dict):
+                raise ValueError(f"Expected a JSON object, got {type(result).__name__}")
             for key in ("service_name", "domain", "terms_url", "privacy_url"):
                 if key not in result:
                     raise ValueError(f"Missing key: {key}")
+                if not isinstance(result[key], str):
+                    raise ValueError(f"Key {key} is not a string: {result[key]!r}")
 
             return result
 
@@ -134,62 +312,76 @@ Rules:
     raise RuntimeError(f"Failed to resolve service after {retries + 1} attempts: {last_error}")
 
 
-def extract_attributes(text: str, retries: int = 2) -> list[dict]:
+def _default_attribute(attr_id: str) -> dict:
+    """Placeholder for an attribute the model did not return."""
+    return {
+        "id": attr_id,
+        "value": "Not mentioned in policy",
+        "severity": "neutral",
+        "evidence": "This attribute was not explicitly addressed in the analyzed text.",
+    }
+
+
+def extract_attributes(text: str, retries: int = 2, max_chars: int | None = None) -> list[dict]:
     """
     LLM call #2: Extract policy attributes from scraped legal text.
+    max_chars caps the policy text below what the context window allows.
     
     Returns list of dicts, each with: id, value, severity, evidence
     """
     client = _get_client()
 
-    # Truncate text to ~12k tokens (~48k chars as rough estimate)
-    max_chars = 48000
-    if len(text) > max_chars:
-        text = text[:max_chars] + "\n\n[TEXT TRUNCATED]"
-
-    prompt = f"""Analyze the following Terms of Service / Privacy Policy text.
-
-For each attribute below, return a JSON array of objects. Each object must have:
-- "id": the attribute ID exactly as listed
-- "value": factual answer (e.g. "Yes", "No", "30 days", etc.)
-- "severity": exactly one of "good", "neutral", or "bad"
-- "evidence": a single sentence quoted or paraphrased from the text
-
-Severity guide:
-- "good" = user-friendly (e.g. no data selling, easy deletion, encryption present)
-- "bad" = user-hostile (e.g. sells data, mandatory arbitration, no deletion)
-- "neutral" = ambiguous or standard industry practice
-
-Attributes to extract:
-1. data_selling — Does the service sell user data to third parties?
-2. data_sharing — Does it share data with affiliates/partners beyond what's needed?
-3. account_deletion — Can users fully delete their account and data?
-4. encryption — Is user data encrypted at rest and in transit?
-5. data_retention — How long is data kept after account deletion?
-6. third_party_tracking — Are third-party trackers/analytics/ad cookies used?
-7. government_requests — Does the company comply with government data requests without notifying users?
-8. arbitration_clause — Is there a mandatory arbitration clause?
-9. class_action_waiver — Does the user waive class-action lawsuit rights?
-10. unilateral_changes — Can the company change terms without prior notice?
-11. liability_limitation — Is the company's liability capped or broadly excluded?
-12. content_license — Does the company claim a broad license to user-generated content?
-
-Return ONLY a valid JSON array, no explanations, no markdown fences.
-
-TEXT:
-{text}"""
+    # Truncate text to whatever fits in the context window
+    limit = _EXTRACT_MAX_CHARS if max_chars is None else min(max_chars, _EXTRACT_MAX_CHARS)
+    if len(text) > limit:
+        text = text[:limit] + "\n\n[TEXT TRUNCATED]"
+
+    prompt = f"TEXT:\n{text}"
+
+    # Same model + same instructions + same text → same extraction
+    key = cache_key("a", OLLAMA_MODEL, _EXTRACTOR_SYSTEM, prompt)
+    cached = CACHE.get(key)
+    if cached is not None:
+        logger.info("Extraction cache hit")
+        return cached
 
     last_error = None
     for attempt in range(retries + 1):
         try:
-            response = client.chat(
+            # Stream so we can stop as soon as the JSON array is complete
+            # instead of waiting for the model to run out of tokens
+            stream = client.chat(
                 model=OLLAMA_MODEL,
-                messages=[{"role": "user", "content": prompt}],
-                options={"temperature": 0.1, "num_predict": 2000},
+                messages=[
+                    {"role": "system", "content": _EXTRACTOR_SYSTEM},
+                    {"role": "user", "content": prompt},
+                ],
+                options={
+                    "temperature": 0.1,
+                    "num_predict": EXTRACT_NUM_PREDICT,
+                    "num_ctx": OLLAMA_NUM_CTX,
+                    "num_batch": OLLAMA_NUM_BATCH,
+                },
+                stream=True,
             )
-            content = response["message"]["content"]
+            scanner = _SpanScanner()
+            content = ""
+            result = None
+            try:
+                for chunk in stream:
+                    content += chunk["message"]["content"]
+                    span = scanner.feed(content)
+                    if span:
+                        result = _complete_attributes(content[span[0]:span[1]])
+                        if result is not None:
+                            break
+            finally:
+                # Closing the response tells Ollama to stop generating
+                stream.close()
+
             logger.info(f"Extract attempt {attempt + 1}: {content[:300]}")
-            result = _parse_json(content)
+            if result is None:
+                result = _parse_json(content)
 
             # Normalize: if result is a dict with a list inside, unwrap it
             if isinstance(result, dict):
@@ -203,20 +395,17 @@ TEXT:
             if not isinstance(result, list):
                 raise ValueError("Expected a JSON array of attributes")
 
-            # Fill in any missing attributes with defaults
-            found_ids = {a.get("id") for a in result if isinstance(a, dict)}
-            for attr_id in EXPECTED_ATTRIBUTES:
-                if attr_id not in found_ids:
-                    result.append({
-                        "id": attr_id,
-                        "value": "Not mentioned in policy",
-                        "severity": "neutral",
-                        "evidence": "This attribute was not explicitly addressed in the analyzed text.",
-                    })
-
-            # Filter to only expected attributes
-            result = [a for a in result if isinstance(a, dict) and a.get("id") in EXPECTED_ATTRIBUTES]
-
+            # One entry per expected attribute, in EXPECTED_ATTRIBUTES order;
+            # the first occurrence of an id wins, missing ones get defaults
+            by_id: dict[str, dict] = {}
+            for a in result:
+                if isinstance(a, dict):
+                    attr_id = a.get("id")
+                    if isinstance(attr_id, str) and attr_id in _EXPECTED_SET:
+                        by_id.setdefault(attr_id, a)
+            result = [by_id.get(attr_id) or _default_attribute(attr_id) for attr_id in EXPECTED_ATTRIBUTES]
+
+            CACHE.set(key, result, expire=RETAIN_TTL)
             return result
 
         except Exception as e:
@@ -226,6 +415,39 @@ TEXT:
     raise RuntimeError(f"Failed to extract attributes after {retries + 1} attempts: {last_error}")
 
 
+def _is_definite(attr: dict | None) -> bool:
+    """True for an extracted attribute with a good or bad answer."""
+    return attr is not None and str(attr.get("severity", "")).strip().lower() in ("good", "bad")
+
+
+def merge_section_attributes(
+    terms: list[dict] | None, privacy: list[dict] | None
+) -> list[dict]:
+    """
+    Merge attributes extracted separately from the terms and privacy pages.
+    For each attribute the page that normally covers it wins unless its
+    answer is neutral and the other page gave a definite one.
+    Either side may be None when that page was unavailable.
+    """
+    terms_by_id = {a["id"]: a for a in terms or ()}
+    privacy_by_id = {a["id"]: a for a in privacy or ()}
+
+    merged = []
+    for attr_id in EXPECTED_ATTRIBUTES:
+        if attr_id in _TERMS_ATTRIBUTES:
+            home, other = terms_by_id.get(attr_id), privacy_by_id.get(attr_id)
+        else:
+            home, other = privacy_by_id.get(attr_id), terms_by_id.get(attr_id)
+
+        if _is_definite(home):
+            merged.append(home)
+        elif _is_definite(other):
+            merged.append(other)
+        else:
+            merged.append(home or other or _default_attribute(attr_id))
+    return merged
+
+
 def check_connection() -> bool:
     """Check if Ollama is reachable."""
     try:
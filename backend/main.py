@@ -5,15 +5,30 @@ Works in two modes:
 2. WITHOUT Ollama: Uses known-services database + keyword heuristics (works immediately)
 """
 
+import asyncio
 import logging
+import os
+import secrets
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 
-from fastapi import FastAPI, HTTPException
+from cachetools import TTLCache
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 
+from cache import CACHE
 from models import AnalyzeRequest, AnalyzeResponse
 from known_services import lookup_service
-from scraper import scrape_policies
+from scraper import (
+    MAX_TEXT_LENGTH,
+    PRIVACY_SECTION,
+    TERMS_SECTION,
+    combine_sections,
+    create_client,
+    format_section,
+    iter_policy_sections,
+)
 from scoring import compute_score
 from extractor import extract_attributes_heuristic
 
@@ -22,15 +37,58 @@ logger = logging.getLogger(__name__)
 
 # Try to import LLM module — optional dependency
 try:
-    from llm import resolve_service, extract_attributes, check_connection
+    from llm import resolve_service, extract_attributes, merge_section_attributes, check_connection
     HAS_LLM = True
-except Exception:
+except Exception as e:
+    logger.warning(f"LLM support disabled: {e}")
     HAS_LLM = False
 
+# Policies change rarely, so finished analyses are kept for a day and scraped
+# text for a few hours. Both are per-process; /cache/invalidate clears them
+# along with the on-disk cache.
+RESPONSE_CACHE_TTL = 24 * 3600
+SCRAPE_CACHE_TTL = 6 * 3600
+
+_response_cache: TTLCache = TTLCache(maxsize=1024, ttl=RESPONSE_CACHE_TTL)
+_scrape_cache: TTLCache = TTLCache(maxsize=256, ttl=SCRAPE_CACHE_TTL)
+_cache_lock = asyncio.Lock()
+
+# Clearing the caches forces every query to be scraped and analyzed again,
+# so /cache/invalidate requires this token (sent as X-Admin-Token) and is
+# disabled when it is unset
+ADMIN_TOKEN = os.getenv("SEASAW_ADMIN_TOKEN", "")
+
+# Ollama availability: (time.monotonic() of last probe, reachable)
+OLLAMA_CHECK_TTL = 30.0
+_ollama_status: tuple[float, bool] | None = None
+_ollama_refresh: asyncio.Task | None = None
+
+# The Ollama client is blocking, so LLM calls run in worker threads; this
+# caps how many are in flight at once so a burst doesn't swamp Ollama
+LLM_CONCURRENCY = 4
+_llm_semaphore = asyncio.Semaphore(LLM_CONCURRENCY)
+
+# Each policy page gets its own extraction call. Splitting the budget the
+# single combined-text call had (MAX_TEXT_LENGTH) between them keeps the
+# total prompt size per analysis the same.
+PAGE_EXTRACT_MAX_CHARS = MAX_TEXT_LENGTH // 2
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Hold one shared scraping HTTP client for the app's lifetime."""
+    app.state.http_client = create_client()
+    try:
+        yield
+    finally:
+        await app.state.http_client.aclose()
+
+
 app = FastAPI(
     title="Seasaw TrustScore API",
     description="Analyze Terms of Service & Privacy Policies",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Allow Next.js dev server
@@ -42,8 +100,8 @@ app.add_middleware(
 )
 
 
-def _check_ollama() -> bool:
-    """Check if Ollama LLM is available."""
+def _probe_ollama() -> bool:
+    """Check if Ollama LLM is available (blocking network call)."""
     if not HAS_LLM:
         return False
     try:
@@ -52,10 +110,39 @@ def _check_ollama() -> bool:
         return False
 
 
+async def _refresh_ollama() -> bool:
+    """Probe Ollama off the event loop and record the result."""
+    global _ollama_status
+    ok = await asyncio.to_thread(_probe_ollama)
+    _ollama_status = (time.monotonic(), ok)
+    return ok
+
+
+async def _check_ollama() -> bool:
+    """
+    Check if Ollama LLM is available.
+    The result is cached for OLLAMA_CHECK_TTL seconds; once stale, the last
+    known value is returned while a background task re-probes, so requests
+    only wait on the very first check.
+    """
+    global _ollama_refresh
+    if not HAS_LLM:
+        return False
+    if _ollama_status is None:
+        return await _refresh_ollama()
+
+    checked_at, ok = _ollama_status
+    if time.monotonic() - checked_at >= OLLAMA_CHECK_TTL and (
+        _ollama_refresh is None or _ollama_refresh.done()
+    ):
+        _ollama_refresh = asyncio.create_task(_refresh_ollama())
+    return ok
+
+
 @app.get("/health")
 async def health():
     """Health check."""
-    ollama_ok = _check_ollama()
+    ollama_ok = await _check_ollama()
     return {
         "status": "ok",
         "mode": "llm" if ollama_ok else "heuristic",
@@ -63,6 +150,54 @@ async def health():
     }
 
 
+@app.post("/cache/invalidate")
+async def invalidate_cache(x_admin_token: str | None = Header(default=None)):
+    """Drop all cached analyses, scraped pages and LLM extractions."""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Cache invalidation is disabled (SEASAW_ADMIN_TOKEN not set)")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+    async with _cache_lock:
+        cleared = len(_response_cache) + len(_scrape_cache)
+        _response_cache.clear()
+        _scrape_cache.clear()
+    cleared += CACHE.clear()
+    logger.info(f"Cache invalidated ({cleared} entries)")
+    return {"status": "ok", "cleared": cleared}
+
+
+async def _iter_sections_cached(terms_url: str, privacy_url: str):
+    """
+    Yield (label, url, text) for each policy page as it is scraped, reusing
+    recent results for the same URL pair.
+    """
+    key = (terms_url, privacy_url)
+    async with _cache_lock:
+        pages = _scrape_cache.get(key)
+    if pages is not None:
+        logger.info("Scrape cache hit")
+        for page in pages:
+            yield page
+        return
+
+    pages = []
+    async for page in iter_policy_sections(app.state.http_client, terms_url, privacy_url):
+        pages.append(page)
+        yield page
+
+    # Only keep complete scrapes — a blocked or empty page should be retried
+    # by the next request, not pinned for SCRAPE_CACHE_TTL
+    if pages and all(text for _, _, text in pages):
+        async with _cache_lock:
+            _scrape_cache[key] = pages
+
+
+async def _extract_llm(text: str) -> list[dict]:
+    """Run LLM attribute extraction on one policy page in a worker thread."""
+    async with _llm_semaphore:
+        return await asyncio.to_thread(extract_attributes, text, max_chars=PAGE_EXTRACT_MAX_CHARS)
+
+
 @app.post("/analyze", response_model=AnalyzeResponse)
 async def analyze(request: AnalyzeRequest):
     """
@@ -76,9 +211,17 @@ async def analyze(request: AnalyzeRequest):
     query = request.query.strip()
     logger.info(f"Analyzing: {query}")
     
-    use_llm = _check_ollama()
+    use_llm = await _check_ollama()
     logger.info(f"Mode: {'LLM' if use_llm else 'Heuristic'}")
 
+    # LLM and heuristic results differ, so the mode is part of the key
+    cache_key = (use_llm, query.lower())
+    async with _cache_lock:
+        cached = _response_cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"Response cache hit: {query}")
+        return cached
+
     # Step 1: Resolve service
     service = None
     
@@ -88,7 +231,8 @@ async def analyze(request: AnalyzeRequest):
         logger.info(f"Found in known services: {service['service_name']}")
     elif use_llm:
         try:
-            service = resolve_service(query)
+            async with _llm_semaphore:
+                service = await asyncio.to_thread(resolve_service, query)
             logger.info(f"LLM resolved: {service}")
         except Exception as e:
             logger.error(f"LLM resolution failed: {e}")
@@ -99,18 +243,32 @@ async def analyze(request: AnalyzeRequest):
             detail=f"Could not identify the service '{query}'. Try one of: Netflix, Spotify, Google, Amazon, Discord, TikTok, Instagram, Uber, etc.",
         )
 
-    # Step 2: Scrape policies
+    # Step 2: Scrape policies. In LLM mode each page's extraction starts as
+    # soon as that page is scraped, overlapping it with the other download.
+    sections: dict[str, str] = {}
+    extractions: dict[str, asyncio.Task] = {}
+    # Whether every requested page produced text (and, in LLM mode, was
+    # analyzed); partial results are served but never cached
+    complete = True
     try:
-        policy_text = await scrape_policies(
-            terms_url=service.get("terms_url", ""),
-            privacy_url=service.get("privacy_url", ""),
-        )
+        async for label, url, text in _iter_sections_cached(
+            service.get("terms_url", ""), service.get("privacy_url", "")
+        ):
+            sections[label] = format_section(label, url, text)
+            complete = complete and bool(text)
+            if use_llm and text:
+                extractions[label] = asyncio.create_task(_extract_llm(sections[label]))
+
+        policy_text = combine_sections(sections)
+        complete = complete and bool(sections)
         logger.info(f"Scraped {len(policy_text)} chars of policy text")
         
         if len(policy_text.strip()) < 50:
             raise ValueError("Scraped text too short — pages may be blocked or empty")
             
     except Exception as e:
+        for task in extractions.values():
+            task.cancel()
         logger.error(f"Scraping failed: {e}")
         raise HTTPException(
             status_code=502,
@@ -120,7 +278,22 @@ async def analyze(request: AnalyzeRequest):
     # Step 3: Extract attributes
     try:
         if use_llm:
-            raw_attributes = extract_attributes(policy_text)
+            # Both pages' extractions are already running; a page whose
+            # extraction fails just contributes nothing to the merge
+            by_page: dict[str, list[dict]] = {}
+            for label, task in extractions.items():
+                try:
+                    by_page[label] = await task
+                except Exception as e:
+                    logger.error(f"Attribute extraction failed for {label}: {e}")
+                    complete = False
+            complete = complete and bool(extractions)
+            if extractions and not by_page:
+                raise RuntimeError("LLM extraction failed for every policy page")
+
+            raw_attributes = merge_section_attributes(
+                by_page.get(TERMS_SECTION), by_page.get(PRIVACY_SECTION)
+            )
         else:
             raw_attributes = extract_attributes_heuristic(policy_text)
         logger.info(f"Extracted {len(raw_attributes)} attributes")
@@ -135,25 +308,22 @@ async def analyze(request: AnalyzeRequest):
     score, grade, enriched_attributes = compute_score(raw_attributes)
     logger.info(f"Score: {score} ({grade})")
 
-    # Step 5: Build response
-    return AnalyzeResponse(
-        service_name=service.get("service_name", query),
-        domain=service.get("domain", ""),
-        terms_url=service.get("terms_url", ""),
-        privacy_url=service.get("privacy_url", ""),
-        trust_score=score,
-        grade=grade,
-        analyzed_at=datetime.now(timezone.utc).isoformat(),
-        attributes=[
-            {
-                "id": a["id"],
-                "label": a["label"],
-                "value": a["value"],
-                "severity": a["severity"],
-                "evidence": a["evidence"],
-                "weight": a["weight"],
-                "points_earned": a["points_earned"],
-            }
-            for a in enriched_attributes
-        ],
-    )
+    # Step 5: Build response; FastAPI validates and serializes it as AnalyzeResponse
+    payload = {
+        "service_name": service.get("service_name", query),
+        "domain": service.get("domain", ""),
+        "terms_url": service.get("terms_url", ""),
+        "privacy_url": service.get("privacy_url", ""),
+        "trust_score": score,
+        "grade": grade,
+        "analyzed_at": datetime.now(timezone.utc).isoformat(),
+        "attributes": enriched_attributes,
+        "error": None,
+    }
+
+    if complete:
+        async with _cache_lock:
+            _response_cache[cache_key] = payload
+    else:
+        logger.info(f"Not caching partial analysis for {query}")
+    return payload
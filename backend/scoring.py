@@ -17,6 +17,13 @@ ATTRIBUTE_WEIGHTS: dict[str, tuple[int, str]] = {
     "content_license":     (5,  "License to Your Content"),
 }
 
+# Split views of ATTRIBUTE_WEIGHTS for per-attribute lookups
+_WEIGHTS: dict[str, int] = {k: v[0] for k, v in ATTRIBUTE_WEIGHTS.items()}
+_LABELS: dict[str, str] = {k: v[1] for k, v in ATTRIBUTE_WEIGHTS.items()}
+
+# Severity → share of the attribute's weight that is earned
+_SEV: dict[str, float] = {"good": 1.0, "neutral": 0.5, "bad": 0.0}
+
 GRADE_THRESHOLDS = [
     (80, "A"),
     (60, "B"),
@@ -28,20 +35,41 @@ GRADE_THRESHOLDS = [
 
 def get_label(attribute_id: str) -> str:
     """Return human-readable label for an attribute id."""
-    entry = ATTRIBUTE_WEIGHTS.get(attribute_id)
-    return entry[1] if entry else attribute_id.replace("_", " ").title()
+    label = _LABELS.get(attribute_id)
+    return label if label else attribute_id.replace("_", " ").title()
 
 
 def get_weight(attribute_id: str) -> int:
     """Return the point weight for an attribute id."""
-    entry = ATTRIBUTE_WEIGHTS.get(attribute_id)
-    return entry[0] if entry else 0
+    return _WEIGHTS.get(attribute_id, 0)
 
 
 def severity_to_multiplier(severity: str) -> float:
     """Convert severity string to a score multiplier."""
-    mapping = {"good": 1.0, "neutral": 0.5, "bad": 0.0}
-    return mapping.get(severity.lower(), 0.0)
+    return _SEV.get(severity.lower(), 0.0)
+
+
+def _enrich(attr: dict) -> dict:
+    """Attach label, weight and earned points to one attribute dict."""
+    attr_id = attr["id"]
+    # Normalized once; used for both the multiplier and the output. Anything
+    # outside good/neutral/bad already scored 0, so it is reported as bad.
+    severity = str(attr.get("severity", "bad")).strip().lower()
+    if severity not in _SEV:
+        severity = "bad"
+    weight = _WEIGHTS.get(attr_id, 0)
+    value = attr.get("value")
+    evidence = attr.get("evidence")
+
+    return {
+        "id": attr_id,
+        "label": get_label(attr_id),
+        "value": "Unknown" if value is None else str(value),
+        "severity": severity,
+        "evidence": "No evidence found." if evidence is None else str(evidence),
+        "weight": weight,
+        "points_earned": round(weight * _SEV.get(severity, 0.0), 1),
+    }
 
 
 def compute_score(
@@ -54,25 +82,8 @@ def compute_score(
     
     Returns: (score 0-100, grade letter, enriched attributes with weight/points)
     """
-    total = 0.0
-    enriched = []
-
-    for attr in attributes:
-        attr_id = attr["id"]
-        weight = get_weight(attr_id)
-        multiplier = severity_to_multiplier(attr.get("severity", "bad"))
-        points = weight * multiplier
-
-        enriched.append({
-            "id": attr_id,
-            "label": get_label(attr_id),
-            "value": attr.get("value", "Unknown"),
-            "severity": attr.get("severity", "bad"),
-            "evidence": attr.get("evidence", "No evidence found."),
-            "weight": weight,
-            "points_earned": round(points, 1),
-        })
-        total += points
+    enriched = [_enrich(attr) for attr in attributes]
+    total = sum(a["weight"] * _SEV.get(a["severity"], 0.0) for a in enriched)
 
     score = min(100, max(0, round(total)))
 
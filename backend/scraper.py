@@ -1,13 +1,32 @@
-"""Web scraper — validates URLs and extracts legal page text."""
+"""Web scraper — fetches legal pages and extracts their text."""
 
+import asyncio
+import codecs
 import logging
 import re
+import time
+from collections.abc import AsyncIterator
 
 import httpx
 import trafilatura
+from selectolax.lexbor import LexborHTMLParser
+
+from cache import CACHE, RETAIN_TTL, SCRAPE_TTL, cache_key
 
 logger = logging.getLogger(__name__)
 
+# httpx only decodes brotli responses when brotli or brotlicffi is installed;
+# otherwise "br" must not be advertised or the body arrives undecoded
+try:
+    import brotli  # noqa: F401
+    HAS_BROTLI = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        HAS_BROTLI = True
+    except ImportError:
+        HAS_BROTLI = False
+
 # Realistic browser user-agent
 USER_AGENT = (
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
@@ -19,40 +38,111 @@ HEADERS = {
     "User-Agent": USER_AGENT,
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
     "Accept-Language": "en-US,en;q=0.9",
-    "Accept-Encoding": "gzip, deflate, br",
+    "Accept-Encoding": "gzip, deflate, br" if HAS_BROTLI else "gzip, deflate",
 }
 
 # Max text length (~12k tokens ≈ 48k chars)
 MAX_TEXT_LENGTH = 48000
 
+# Max HTML read per page. Policy pages are mostly markup and inline script
+# (often 200-800 KB), so this only guards against pathological responses.
+MAX_HTML_BYTES = 5 * 1024 * 1024
+
+# Section labels, in the order sections appear in the combined text
+TERMS_SECTION = "TERMS OF SERVICE"
+PRIVACY_SECTION = "PRIVACY POLICY"
+
+# Whitespace cleanup for extracted text
+_MULTI_NL = re.compile(r"\n{3,}")
+_MULTI_SP = re.compile(r" {2,}")
 
-async def validate_url(url: str, timeout: float = 10.0) -> bool:
-    """Check if a URL is reachable. Tries HEAD first, falls back to GET."""
-    try:
-        async with httpx.AsyncClient(
-            follow_redirects=True, timeout=timeout, headers=HEADERS
-        ) as client:
-            resp = await client.head(url)
-            if resp.status_code == 405:
-                # Some sites (e.g. Amazon) reject HEAD — try GET
-                resp = await client.get(url)
-            return resp.status_code < 400
-    except Exception as e:
-        logger.warning(f"URL validation failed for {url}: {e}")
-        return False
 
+def create_client() -> httpx.AsyncClient:
+    """
+    Build the HTTP client shared by all scraping calls.
+    Created once at app startup so connections (DNS, TCP, TLS) are reused
+    across requests; HTTP/2 multiplexes fetches to the same host.
+    """
+    logger.info(f"Scraper Accept-Encoding: {HEADERS['Accept-Encoding']}")
+    return httpx.AsyncClient(
+        http2=True,
+        follow_redirects=True,
+        timeout=20.0,
+        headers=HEADERS,
+        limits=httpx.Limits(max_keepalive_connections=20),
+    )
+
+
+async def fetch_html(
+    client: httpx.AsyncClient,
+    url: str,
+    timeout: float = 20.0,
+    headers: dict[str, str] | None = None,
+) -> tuple[str | bytes | None, httpx.Headers]:
+    """
+    Fetch the raw HTML from a URL with a single GET.
+    Raises for network errors and 4xx/5xx responses; bodies larger than
+    MAX_HTML_BYTES are cut off rather than read into memory.
+    Returns (html, response headers). html is None when a conditional
+    request (extra headers) is answered with 304 Not Modified.
 
-async def fetch_html(url: str, timeout: float = 20.0) -> str:
-    """Fetch the raw HTML from a URL."""
-    async with httpx.AsyncClient(
-        follow_redirects=True, timeout=timeout, headers=HEADERS
-    ) as client:
-        resp = await client.get(url)
+    html is left as bytes, which both parsers read directly, unless the
+    server declared a non-UTF-8 charset; only then is it decoded here.
+    """
+    async with client.stream("GET", url, timeout=timeout, headers=headers) as resp:
+        if headers and resp.status_code == 304:
+            return None, resp.headers
         resp.raise_for_status()
-        return resp.text
+
+        chunks = []
+        size = 0
+        truncated = False
+        async for chunk in resp.aiter_bytes():
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= MAX_HTML_BYTES:
+                logger.warning(f"Truncating {url} at {MAX_HTML_BYTES} bytes")
+                truncated = True
+                break
+
+        html = b"".join(chunks)[:MAX_HTML_BYTES]
+
+        charset = resp.charset_encoding
+        if charset:
+            try:
+                if codecs.lookup(charset).name != "utf-8":
+                    return html.decode(charset, errors="replace"), resp.headers
+            except LookupError:
+                pass
+        if truncated:
+            html = _trim_partial_utf8(html)
+        return html, resp.headers
+
+
+def _trim_partial_utf8(data: bytes) -> bytes:
+    """
+    Drop a UTF-8 sequence left incomplete at the end of a cut-off body.
+    A torn final character makes trafilatura's charset detection give up
+    on UTF-8 and decode the whole page as something else.
+    """
+    for back in range(1, min(4, len(data)) + 1):
+        byte = data[-back]
+        if byte & 0xC0 == 0x80:  # continuation byte, keep looking for the lead
+            continue
+        needed = 4 if byte >= 0xF0 else 3 if byte >= 0xE0 else 2 if byte >= 0xC0 else 1
+        return data[:-back] if needed > back else data
+    return data
+
+
+def _truncate(text: str) -> str:
+    """Cut text to MAX_TEXT_LENGTH, backing up to the last word boundary."""
+    if len(text) <= MAX_TEXT_LENGTH:
+        return text
+    cut = text.rfind(" ", 0, MAX_TEXT_LENGTH)
+    return text[:cut if cut > 0 else MAX_TEXT_LENGTH]
 
 
-def extract_text(html: str, url: str | None = None) -> str:
+def extract_text(html: str | bytes, url: str | None = None) -> str:
     """
     Extract main text content from HTML, stripping boilerplate.
     Uses trafilatura for best results.
@@ -69,73 +159,123 @@ def extract_text(html: str, url: str | None = None) -> str:
 
     if not text or len(text.strip()) < 200:
         # Fallback: basic HTML stripping
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(html, "html.parser")
+        tree = LexborHTMLParser(html)
 
         # Remove script, style, nav, footer
-        for tag in soup.find_all(["script", "style", "nav", "footer", "header"]):
+        for tag in tree.css("script, style, nav, footer, header"):
             tag.decompose()
 
-        text = soup.get_text(separator="\n", strip=True)
+        text = tree.body.text(separator="\n", strip=True) if tree.body else ""
 
     if not text:
         return ""
 
     # Clean up excessive whitespace
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    text = re.sub(r" {2,}", " ", text)
+    text = _MULTI_NL.sub("\n\n", text)
+    text = _MULTI_SP.sub(" ", text)
 
-    # Truncate
-    if len(text) > MAX_TEXT_LENGTH:
-        text = text[:MAX_TEXT_LENGTH]
+    return _truncate(text).strip()
 
-    return text.strip()
 
-
-async def scrape_page(url: str) -> str:
+async def scrape_page(client: httpx.AsyncClient, url: str) -> str | None:
     """
     Full pipeline: fetch URL → extract text.
-    Returns extracted text or empty string on failure.
+    Returns extracted text, empty string if no text could be extracted,
+    or None if the page could not be fetched at all.
+    Extracted text is kept in the disk cache; stale entries are revalidated
+    with the page's ETag / Last-Modified instead of re-downloaded.
     """
+    key = cache_key("s", url)
+    entry = CACHE.get(key)
+    if entry and time.time() - entry["fetched_at"] < SCRAPE_TTL:
+        logger.info(f"Cache hit for {url}: {len(entry['text'])} chars")
+        return entry["text"]
+
+    conditional = {}
+    if entry:
+        if entry["etag"]:
+            conditional["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            conditional["If-Modified-Since"] = entry["last_modified"]
+
     try:
-        html = await fetch_html(url)
-        text = extract_text(html, url=url)
-        logger.info(f"Scraped {url}: {len(text)} chars")
-        return text
+        html, headers = await fetch_html(client, url, headers=conditional or None)
     except Exception as e:
-        logger.error(f"Failed to scrape {url}: {e}")
-        return ""
+        logger.warning(f"URL invalid/unreachable, skipping: {url} ({e})")
+        return None
 
+    if html is None:
+        logger.info(f"Not modified since last scrape: {url}")
+        text = entry["text"]
+    else:
+        try:
+            text = extract_text(html, url=url)
+            logger.info(f"Scraped {url}: {len(text)} chars")
+        except Exception as e:
+            logger.error(f"Failed to scrape {url}: {e}")
+            return ""
 
-async def scrape_policies(
-    terms_url: str, privacy_url: str
-) -> str:
-    """
-    Scrape both terms and privacy pages, combine into one text block.
-    Validates URLs first and skips any that fail.
-    """
-    sections = []
+    if text:
+        CACHE.set(
+            key,
+            {
+                "text": text,
+                "etag": headers.get("etag") or (entry and entry["etag"]),
+                "last_modified": headers.get("last-modified") or (entry and entry["last_modified"]),
+                "fetched_at": time.time(),
+            },
+            expire=RETAIN_TTL,
+        )
+    return text
 
-    for label, url in [("TERMS OF SERVICE", terms_url), ("PRIVACY POLICY", privacy_url)]:
-        if not url:
-            continue
 
-        is_valid = await validate_url(url)
-        if not is_valid:
-            logger.warning(f"URL invalid/unreachable, skipping: {url}")
-            sections.append(f"=== {label} ===\n[Could not access {url}]\n")
-            continue
+def format_section(label: str, url: str, text: str | None) -> str:
+    """Render one scraped page as a labelled block, noting pages that failed."""
+    if text is None:
+        return f"=== {label} ===\n[Could not access {url}]\n"
+    if text:
+        return f"=== {label} ===\n{text}\n"
+    return f"=== {label} ===\n[Failed to extract text from {url}]\n"
 
-        text = await scrape_page(url)
-        if text:
-            sections.append(f"=== {label} ===\n{text}\n")
-        else:
-            sections.append(f"=== {label} ===\n[Failed to extract text from {url}]\n")
 
-    combined = "\n\n".join(sections)
+def combine_sections(sections: dict[str, str]) -> str:
+    """Join formatted sections into one text block, terms first."""
+    combined = "\n\n".join(
+        sections[label] for label in (TERMS_SECTION, PRIVACY_SECTION) if label in sections
+    )
 
     # Final truncation if combined text is too long
-    if len(combined) > MAX_TEXT_LENGTH:
-        combined = combined[:MAX_TEXT_LENGTH]
+    return _truncate(combined)
 
-    return combined
+
+async def iter_policy_sections(
+    client: httpx.AsyncClient, terms_url: str, privacy_url: str
+) -> AsyncIterator[tuple[str, str, str | None]]:
+    """
+    Scrape the terms and privacy pages concurrently, yielding
+    (label, url, text) for each as soon as it finishes, so callers can start
+    working on one page while the other is still downloading.
+    text follows scrape_page: None if the page could not be fetched.
+    """
+
+    async def scrape_section(label: str, url: str) -> tuple[str, str, str | None]:
+        return label, url, await scrape_page(client, url)
+
+    pages = [(TERMS_SECTION, terms_url), (PRIVACY_SECTION, privacy_url)]
+    for done in asyncio.as_completed([scrape_section(label, url) for label, url in pages if url]):
+        yield await done
+
+
+async def scrape_policies(
+    client: httpx.AsyncClient, terms_url: str, privacy_url: str
+) -> str:
+    """
+    Scrape both terms and privacy pages, combine into one text block.
+    Pages that cannot be fetched are noted and skipped. The two pages are
+    independent, so they are fetched concurrently.
+    """
+    sections = {
+        label: format_section(label, url, text)
+        async for label, url, text in iter_policy_sections(client, terms_url, privacy_url)
+    }
+    return combine_sections(sections)
@@ -0,0 +1,197 @@
+"""Tests for the heuristic attribute extractor."""
+
+import ast
+import random
+import re
+from pathlib import Path
+from re import _constants as sre_constants
+from re import _parser as sre_parse
+
+import pytest
+
+import extractor
+
+EXTRACTOR_PATH = Path(__file__).resolve().parent.parent / "extractor.py"
+
+
+def test_no_module_level_regex_calls():
+    # Patterns are compiled once at import; calling re.search/re.match with a
+    # pattern (string or compiled) goes back through re's compile cache
+    tree = ast.parse(EXTRACTOR_PATH.read_text(encoding="utf-8"))
+    offenders = [
+        f"line {node.lineno}: {node.func.value.id}.{node.func.attr}"
+        for node in ast.walk(tree)
+        if isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and isinstance(node.func.value, ast.Name)
+        and node.func.value.id in ("re", "re2")
+        and node.func.attr in ("search", "match", "fullmatch", "findall", "finditer")
+    ]
+    assert not offenders, offenders
+
+
+def _all_patterns():
+    for attr_id, buckets in extractor.ATTRIBUTE_PATTERNS.items():
+        for severity, patterns in buckets.items():
+            for pattern in patterns:
+                yield attr_id, severity, pattern
+
+
+def test_patterns_are_lowercase():
+    # Patterns run against lowercased text without IGNORECASE, so an
+    # uppercase literal could never match; escapes like \S are exempt
+    offenders = [
+        (attr_id, severity, pattern)
+        for attr_id, severity, pattern in _all_patterns()
+        if (unescaped := re.sub(r"\\.", "", pattern)) != unescaped.lower()
+    ]
+    assert not offenders, offenders
+
+
+# --- Literal prefilter and lowercased matching vs. the original behaviour ---
+
+# Characters used when sampling \s, \w, \d and "."
+_SPACE_CHARS = [" ", "  ", "\n", "\t", "\u00a0"]
+# Non-ASCII letters and digits (é, ß, the "ﬁ" ligature, superscript two,
+# Arabic-Indic and fullwidth digits) catch engines with ASCII-only classes;
+# "İ", "ı" and "ſ" match "i"/"s" under IGNORECASE but not after str.lower()
+_WORD_CHARS = "abxz_9éßﬁ²٣İıſ"
+_DIGIT_CHARS = "0479٣５"
+_ANY_CHARS = "ab -'’.,é\u0301"
+
+_FILLER = (
+    "the a of and you your we our data information personal account terms "
+    "policy service may will share third party legal right content İstanbul Straße "
+    "ſell ſhare thırd bİnding arbİtratıon"
+).split()
+
+
+def _sample_class(items, rng):
+    choices = []
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            choices.append(chr(av))
+        elif op is sre_constants.RANGE:
+            choices.append(chr(rng.randint(*av)))
+        elif op is sre_constants.CATEGORY:
+            choices.extend({
+                sre_constants.CATEGORY_SPACE: _SPACE_CHARS,
+                sre_constants.CATEGORY_WORD: list(_WORD_CHARS),
+                sre_constants.CATEGORY_DIGIT: list(_DIGIT_CHARS),
+            }[av])
+        else:
+            raise NotImplementedError(op)
+    return rng.choice(choices)
+
+
+def _sample(parsed, rng) -> str:
+    """Build a random string matching a parsed pattern (the subset used here)."""
+    out = []
+    for op, av in parsed:
+        if op is sre_constants.LITERAL:
+            out.append(chr(av))
+        elif op is sre_constants.SUBPATTERN:
+            out.append(_sample(av[-1], rng))
+        elif op is sre_constants.BRANCH:
+            out.append(_sample(rng.choice(av[1]), rng))
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            lo, hi, sub = av
+            out.extend(_sample(sub, rng) for _ in range(rng.randint(lo, min(hi, lo + 3))))
+        elif op is sre_constants.ANY:
+            out.append(rng.choice(_ANY_CHARS))
+        elif op is sre_constants.IN:
+            out.append(_sample_class(av, rng))
+        else:
+            raise NotImplementedError(op)
+    return "".join(out)
+
+
+def _corpus(n: int = 400) -> list[str]:
+    """
+    Texts mixing filler words with strings sampled from the patterns
+    themselves, in varied casing, plus mutated near-misses.
+    """
+    patterns = [sre_parse.parse(p) for _, _, p in _all_patterns()]
+    texts = []
+    for seed in range(n):
+        rng = random.Random(seed)
+        parts = []
+        for _ in range(rng.randint(0, 40)):
+            if rng.random() < 0.3:
+                part = _sample(rng.choice(patterns), rng)
+                if rng.random() < 0.3:
+                    cut = rng.randrange(len(part) or 1)
+                    part = part[:cut] + part[cut + 1:]  # near-miss
+            else:
+                part = rng.choice(_FILLER)
+            roll = rng.random()
+            if roll < 0.15:
+                part = part.upper()
+            elif roll < 0.3:
+                part = part.capitalize()
+            parts.append(part)
+        texts.append(rng.choice([" ", ". ", "\n\n"]).join(parts))
+    return texts
+
+
+CORPUS = _corpus()
+
+
+def _reference_span(patterns, text):
+    """First-match span as originally computed: IGNORECASE on the raw text."""
+    for pattern in patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            return match.span()
+    return None
+
+
+def test_first_match_agrees_with_ignorecase_search():
+    # Covers lowercasing, the required-literal prefilter, non-capturing
+    # rewrites and whichever regex engine is installed
+    for text in CORPUS:
+        text_lc = extractor._lowercase(text)
+        present = extractor._LiteralPresence(text_lc)
+        for attr_id, buckets in extractor.ATTRIBUTE_PATTERNS.items():
+            for severity, patterns in buckets.items():
+                compiled = extractor._COMPILED_PATTERNS[attr_id][severity]
+                assert extractor._first_match(text_lc, compiled, present) == _reference_span(
+                    patterns, text
+                ), (attr_id, severity, text)
+
+
+def test_required_literals_appear_in_every_match():
+    for _, _, pattern in _all_patterns():
+        literals = extractor._required_literals(pattern)
+        for text in CORPUS:
+            match = re.search(pattern, text, re.IGNORECASE)
+            if match and literals:
+                assert any(lit in extractor._lowercase(text) for lit in literals), (pattern, text)
+
+
+def test_corpus_exercises_every_pattern():
+    for _, _, pattern in _all_patterns():
+        assert any(re.search(pattern, text, re.IGNORECASE) for text in CORPUS), pattern
+
+
+def test_required_literals_examples():
+    assert extractor._required_literals(r"(mandatory|binding|compulsory)\s+arbitration") == {"arbitration"}
+    # Longest required run wins; ties keep the first
+    assert extractor._required_literals(r"class.action\s+waiver") == {"action"}
+    assert extractor._required_literals(r"(ssl|tls|aes|end.to.end)\s+encrypt") == {"encrypt"}
+    assert extractor._required_literals(r"(as.is|as\s+available|without\s+warrant)") == {
+        "as", "available", "without",
+    }
+    # Optional parts never contribute a literal
+    assert extractor._required_literals(r"(may\s+)?(retain|keep)") == {"retain", "keep"}
+
+
+@pytest.mark.skipif(extractor.re2 is None, reason="google-re2 not installed")
+def test_re2_agrees_with_stdlib_re():
+    for text in CORPUS:
+        text_lc = extractor._lowercase(text)
+        for _, _, pattern in _all_patterns():
+            rewritten = extractor._non_capturing(pattern)
+            expected = re.compile(rewritten).search(text_lc)
+            actual = extractor._compile(rewritten).search(text_lc)
+            assert (actual and actual.span()) == (expected and expected.span()), (pattern, text)
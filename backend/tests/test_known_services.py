@@ -0,0 +1,64 @@
+"""Tests for the known-service lookup."""
+
+import random
+
+import pytest
+
+from known_services import KNOWN_SERVICES, lookup_service
+
+
+def _reference_lookup(query: str) -> dict | None:
+    """The original linear scan: exact key, then substring in either direction."""
+    key = query.strip().lower()
+    if key in KNOWN_SERVICES:
+        return KNOWN_SERVICES[key]
+    for k, v in KNOWN_SERVICES.items():
+        if key in k or k in key:
+            return v
+    return None
+
+
+def _queries(n: int = 4000) -> list[str]:
+    """Keys, their substrings, keys embedded in longer queries and noise."""
+    rng = random.Random(0)
+    keys = list(KNOWN_SERVICES)
+    queries = ["", " ", "x", "zzz"]
+    for _ in range(n):
+        key = rng.choice(keys)
+        start = rng.randrange(len(key))
+        roll = rng.random()
+        if roll < 0.4:
+            query = key[start:rng.randrange(start, len(key) + 1)]
+        elif roll < 0.7:
+            query = rng.choice(["", "the ", "my "]) + key + rng.choice(["", " app", "plus", ".com"])
+        else:
+            query = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz ") for _ in range(rng.randint(1, 12)))
+        if rng.random() < 0.3:
+            query = f"  {query.upper()} "
+        queries.append(query)
+    return queries
+
+
+def test_lookup_matches_linear_scan():
+    for query in _queries():
+        assert lookup_service(query) == _reference_lookup(query), query
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("netflix", "Netflix"),
+    ("  Netflix ", "Netflix"),
+    ("net", "Netflix"),           # query is part of a name
+    ("netflix app", "Netflix"),   # name is part of the query
+    ("", "Netflix"),              # empty matches every name; first in table wins
+    ("no such service", None),
+])
+def test_lookup_examples(query, expected):
+    info = lookup_service(query)
+    assert (info and info["service_name"]) == expected
+
+
+def test_lookup_returns_read_only_view():
+    info = lookup_service("netflix")
+    with pytest.raises(TypeError):
+        info["domain"] = "example.com"
+    assert KNOWN_SERVICES["netflix"]["domain"] == "netflix.com"
@@ -0,0 +1,256 @@
+"""Tests for LLM output parsing and streamed extraction (no Ollama needed)."""
+
+import pytest
+
+import llm
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ('[{"id": "a"}]', [{"id": "a"}]),
+    ('```json\n[{"id": "a"}]\n```', [{"id": "a"}]),
+    ('Here you go: [{"id": "a"},]', [{"id": "a"}]),
+    # Brackets inside strings don't end the block
+    ('Sure: [{"id": "a", "evidence": "see [1] and }"}] done', [{"id": "a", "evidence": "see [1] and }"}]),
+    # An earlier balanced block that isn't JSON is skipped...
+    ('Result [see below]: [{"id": "a"}]', [{"id": "a"}]),
+    ('Note {x} then [{"id":"a"}]', [{"id": "a"}]),
+    # The first block that parses wins over later ones
+    ('[{"id": "a"}] and also {"id": "b"}', [{"id": "a"}]),
+])
+def test_parse_json(raw, expected):
+    assert llm._parse_json(raw) == expected
+
+
+@pytest.mark.parametrize("raw", [
+    "no json here",
+    "[unclosed",
+    "{x} [y]",
+    # Truncated or malformed arrays are not reduced to their first element
+    '[{"id": "a"}, {"id": "b", "evidence": "cut off',
+    '[{"id": "a"}, {id: b}]',
+])
+def test_parse_json_rejects_unparseable_output(raw):
+    with pytest.raises(ValueError):
+        llm._parse_json(raw)
+
+
+# --- Streamed extraction against a fake Ollama client ---
+
+class FakeStream:
+    """Yields chat chunks and records how far it was read and whether it was closed."""
+
+    def __init__(self, pieces):
+        self.pieces = pieces
+        self.read = 0
+        self.closed = False
+
+    def __iter__(self):
+        for piece in self.pieces:
+            self.read += 1
+            yield {"message": {"content": piece}}
+
+    def close(self):
+        self.closed = True
+
+
+class FakeClient:
+    def __init__(self, *outputs):
+        self.streams = [FakeStream(pieces) for pieces in outputs]
+        self.calls = 0
+
+    def chat(self, stream=False, **kwargs):
+        assert stream
+        self.calls += 1
+        return self.streams[self.calls - 1]
+
+
+@pytest.fixture
+def fake_ollama(monkeypatch, tmp_path):
+    """Install a FakeClient built from per-attempt output pieces; isolates the disk cache."""
+    import diskcache
+
+    monkeypatch.setattr(llm, "CACHE", diskcache.Cache(str(tmp_path)))
+
+    def install(*outputs):
+        client = FakeClient(*outputs)
+        monkeypatch.setattr(llm, "_get_client", lambda: client)
+        return client
+
+    return install
+
+
+# Brackets, escaped quotes and a trailing backslash inside strings
+SELLING = (
+    '{"id": "data_selling", "value": "No", "severity": "good", '
+    '"evidence": "We never \\"sell\\" data [see section 4] {ok} \\\\"}'
+)
+SELLING_EVIDENCE = 'We never "sell" data [see section 4] {ok} \\'
+
+
+def _pieces(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+def test_stream_stops_once_the_array_closes(fake_ollama, size):
+    # Every split point, including ones between a backslash and what it escapes
+    body = _pieces(f"[{SELLING}]", size)
+    client = fake_ollama(body + ["\n\nExtra commentary", " that should never be read"])
+
+    result = llm.extract_attributes("policy text")
+
+    stream = client.streams[0]
+    assert stream.read == len(body)
+    assert stream.closed
+    assert [a["id"] for a in result] == llm.EXPECTED_ATTRIBUTES
+    assert result[0]["evidence"] == SELLING_EVIDENCE
+    assert result[1] == llm._default_attribute("data_sharing")
+
+
+def test_stream_skips_blocks_that_are_not_the_attribute_list(fake_ollama):
+    # A balanced object without a list doesn't end the stream early
+    client = fake_ollama(["Schema {", '"id": "x"}', f" then [{SELLING}]", " trailing"])
+
+    result = llm.extract_attributes("policy text")
+
+    assert client.streams[0].read == 3
+    assert result[0]["evidence"] == SELLING_EVIDENCE
+
+
+def test_stream_falls_back_to_parse_json(fake_ollama, monkeypatch):
+    # The array has a trailing comma (never parses while streaming) and the
+    # output ends on an unclosed bracket, so the whole stream is read
+    client = fake_ollama(_pieces(f"[{SELLING},]\nSee [1", 5))
+    parsed = []
+    parse_json = llm._parse_json
+    monkeypatch.setattr(llm, "_parse_json", lambda raw: parsed.append(raw) or parse_json(raw))
+
+    result = llm.extract_attributes("policy text")
+
+    stream = client.streams[0]
+    assert stream.read == len(stream.pieces)
+    assert stream.closed
+    assert parsed == [f"[{SELLING},]\nSee [1"]
+    assert result[0]["evidence"] == SELLING_EVIDENCE
+
+
+def test_truncated_stream_is_retried(fake_ollama):
+    truncated = _pieces(f"[{SELLING}, " + '{"id": "data_sharing", "evid', 4)
+    client = fake_ollama(truncated, truncated, [f"[{SELLING}]"])
+
+    result = llm.extract_attributes("policy text")
+
+    assert client.calls == 3
+    assert all(stream.closed for stream in client.streams)
+    assert result[0]["evidence"] == SELLING_EVIDENCE
+
+
+def test_stream_closed_when_reading_fails(fake_ollama):
+    class BrokenStream(FakeStream):
+        def __iter__(self):
+            yield {"message": {"content": "[{"}}
+            raise ConnectionError("connection reset")
+
+    client = fake_ollama([], [], [])
+    client.streams = [BrokenStream([]) for _ in range(3)]
+
+    with pytest.raises(RuntimeError, match="connection reset"):
+        llm.extract_attributes("policy text")
+    assert all(stream.closed for stream in client.streams)
+
+
+def test_span_scanner_resumes_across_feeds():
+    scanner = llm._SpanScanner()
+    text = ""
+    spans = []
+    for ch in 'x ["a\\"]", {"b": "}"}] tail {"c": 1}':
+        text += ch
+        span = scanner.feed(text)
+        if span:
+            spans.append(text[span[0]:span[1]])
+    assert spans == ['["a\\"]", {"b": "}"}]', '{"c": 1}']
+
+
+def test_max_chars_caps_policy_text(fake_ollama):
+    client = fake_ollama([f"[{SELLING}]"])
+    prompts = []
+    chat = client.chat
+    client.chat = lambda **kwargs: prompts.append(kwargs["messages"][1]["content"]) or chat(**kwargs)
+
+    llm.extract_attributes("x" * 5000, max_chars=1000)
+
+    assert prompts == ["TEXT:\n" + "x" * 1000 + "\n\n[TEXT TRUNCATED]"]
+
+
+# --- Merging per-page extractions ---
+
+def _attr(attr_id, severity, page):
+    return {"id": attr_id, "value": page, "severity": severity, "evidence": f"From the {page} page."}
+
+
+def _page(page, severity="bad", **overrides):
+    """One page's extraction: every attribute at severity, with per-id overrides."""
+    return [_attr(attr_id, overrides.get(attr_id, severity), page) for attr_id in llm.EXPECTED_ATTRIBUTES]
+
+
+def _sources(merged):
+    return {a["id"]: (a["value"], a["severity"]) for a in merged}
+
+
+def test_merge_prefers_the_page_that_covers_each_attribute():
+    merged = llm.merge_section_attributes(_page("terms", "bad"), _page("privacy", "good"))
+
+    assert [a["id"] for a in merged] == llm.EXPECTED_ATTRIBUTES
+    for attr_id, (page, _) in _sources(merged).items():
+        assert page == ("terms" if attr_id in llm._TERMS_ATTRIBUTES else "privacy"), attr_id
+
+
+def test_merge_falls_back_when_the_home_page_is_neutral():
+    terms = _page("terms", "bad", data_selling="neutral", arbitration_clause="neutral")
+    privacy = _page("privacy", "neutral", data_selling="good", data_sharing="good")
+
+    sources = _sources(llm.merge_section_attributes(terms, privacy))
+
+    # Terms attribute, terms neutral, privacy neutral: terms' own answer stays
+    assert sources["arbitration_clause"] == ("terms", "neutral")
+    # Privacy attributes, privacy neutral, terms definite: terms fills in
+    assert sources["data_retention"] == ("terms", "bad")
+    # Home page definite: it wins, whatever the other page said
+    assert sources["data_selling"] == ("privacy", "good")
+    assert sources["data_sharing"] == ("privacy", "good")
+    assert sources["class_action_waiver"] == ("terms", "bad")
+
+
+def test_merge_treats_unrecognised_severity_as_not_definite():
+    terms = _page("terms", "bad")
+    privacy = _page("privacy", "good", data_selling="Unclear", data_sharing=" GOOD ")
+
+    sources = _sources(llm.merge_section_attributes(terms, privacy))
+
+    assert sources["data_selling"] == ("terms", "bad")
+    assert sources["data_sharing"] == ("privacy", " GOOD ")
+
+
+@pytest.mark.parametrize("missing", ["terms", "privacy"])
+def test_merge_with_one_page_missing(missing):
+    present = "privacy" if missing == "terms" else "terms"
+    pages = {present: _page(present, "neutral", data_selling="good"), missing: None}
+
+    merged = llm.merge_section_attributes(pages["terms"], pages["privacy"])
+
+    assert [a["id"] for a in merged] == llm.EXPECTED_ATTRIBUTES
+    assert all(a["value"] == present for a in merged)
+    assert _sources(merged)["data_selling"] == (present, "good")
+
+
+def test_merge_fills_gaps_with_defaults():
+    terms = [_attr("arbitration_clause", "bad", "terms")]
+
+    merged = llm.merge_section_attributes(terms, None)
+
+    assert merged[llm.EXPECTED_ATTRIBUTES.index("arbitration_clause")]["value"] == "terms"
+    defaults = [a for a in merged if a["id"] != "arbitration_clause"]
+    assert defaults == [llm._default_attribute(a["id"]) for a in defaults]
+    assert llm.merge_section_attributes(None, None) == [
+        llm._default_attribute(attr_id) for attr_id in llm.EXPECTED_ATTRIBUTES
+    ]
@@ -0,0 +1,95 @@
+"""Tests for TrustScore computation."""
+
+import random
+
+import pytest
+
+from scoring import ATTRIBUTE_WEIGHTS, GRADE_THRESHOLDS, compute_score
+
+
+def _reference_score(attributes: list[dict]) -> tuple[int, str, list[float]]:
+    """Score, grade and per-attribute points as originally computed, one helper call at a time."""
+    multipliers = {"good": 1.0, "neutral": 0.5, "bad": 0.0}
+    points = [
+        ATTRIBUTE_WEIGHTS.get(a["id"], (0, ""))[0] * multipliers.get(a.get("severity", "bad").lower(), 0.0)
+        for a in attributes
+    ]
+    score = min(100, max(0, round(sum(points))))
+    grade = next(letter for threshold, letter in GRADE_THRESHOLDS if score >= threshold)
+    return score, grade, [round(p, 1) for p in points]
+
+
+def _attribute_lists(n: int = 5000) -> list[list[dict]]:
+    rng = random.Random(0)
+    ids = list(ATTRIBUTE_WEIGHTS) + ["unknown_attribute"]
+    severities = ["good", "neutral", "bad", "Good", "NEUTRAL", "Bad", "moderate", "unclear", ""]
+    lists = []
+    for _ in range(n):
+        attributes = []
+        for attr_id in rng.sample(ids, rng.randint(0, len(ids))):
+            attr = {"id": attr_id, "value": "Yes", "evidence": "Quoted text."}
+            if rng.random() < 0.9:
+                attr["severity"] = rng.choice(severities)
+            attributes.append(attr)
+        lists.append(attributes)
+    return lists
+
+
+def test_scores_match_reference():
+    for attributes in _attribute_lists():
+        score, grade, enriched = compute_score(attributes)
+        expected_score, expected_grade, expected_points = _reference_score(attributes)
+        assert (score, grade) == (expected_score, expected_grade), attributes
+        assert [a["points_earned"] for a in enriched] == expected_points, attributes
+
+
+def test_all_good_scores_100():
+    score, grade, _ = compute_score([{"id": k, "severity": "good"} for k in ATTRIBUTE_WEIGHTS])
+    assert (score, grade) == (100, "A")
+
+
+@pytest.mark.parametrize("severity, expected", [
+    ("good", "good"),
+    ("Good", "good"),
+    ("NEUTRAL", "neutral"),
+    (" bad ", "bad"),
+    # Anything unrecognised earns nothing and is reported as such
+    ("moderate", "bad"),
+    ("unclear", "bad"),
+    ("", "bad"),
+    (None, "bad"),
+    (2, "bad"),
+])
+def test_severity_is_normalized(severity, expected):
+    _, _, [attr] = compute_score([{"id": "data_selling", "severity": severity}])
+    assert attr["severity"] == expected
+    assert attr["points_earned"] == {"good": 15.0, "neutral": 7.5, "bad": 0.0}[expected]
+
+
+def test_missing_severity_is_bad():
+    _, _, [attr] = compute_score([{"id": "data_selling"}])
+    assert (attr["severity"], attr["points_earned"]) == ("bad", 0.0)
+
+
+@pytest.mark.parametrize("value, evidence, expected", [
+    (None, None, ("Unknown", "No evidence found.")),
+    (30, ["a"], ("30", "['a']")),
+    (True, "", ("True", "")),
+])
+def test_value_and_evidence_are_strings(value, evidence, expected):
+    _, _, [attr] = compute_score([{"id": "encryption", "value": value, "evidence": evidence}])
+    assert (attr["value"], attr["evidence"]) == expected
+
+
+def test_missing_value_and_evidence_get_defaults():
+    _, _, [attr] = compute_score([{"id": "encryption", "severity": "good"}])
+    assert (attr["value"], attr["evidence"]) == ("Unknown", "No evidence found.")
+
+
+def test_labels_and_weights():
+    _, _, [known, unknown] = compute_score([
+        {"id": "data_selling", "severity": "good"},
+        {"id": "some_new_thing", "severity": "good"},
+    ])
+    assert (known["label"], known["weight"]) == ("Sells User Data", 15)
+    assert (unknown["label"], unknown["weight"], unknown["points_earned"]) == ("Some New Thing", 0, 0.0)
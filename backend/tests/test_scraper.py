@@ -0,0 +1,47 @@
+"""Tests for scraper helpers that cut bodies and text to size."""
+
+import pytest
+
+import scraper
+
+
+@pytest.mark.parametrize("char", ["é", "’", "😀"])  # 2-, 3- and 4-byte sequences
+def test_trim_partial_utf8_drops_incomplete_final_character(char):
+    encoded = char.encode()
+    body = b"<p>ok " + encoded
+    for cut in range(1, len(encoded)):
+        # Cut after the lead byte and after each continuation byte but the last
+        assert scraper._trim_partial_utf8(body[:-len(encoded) + cut]) == b"<p>ok "
+
+
+@pytest.mark.parametrize("body", [
+    b"",
+    b"<p>plain ascii",
+    "<p>ends on é".encode(),
+    "<p>ends on ’".encode(),
+    "<p>ends on 😀".encode(),
+])
+def test_trim_partial_utf8_keeps_complete_character(body):
+    assert scraper._trim_partial_utf8(body) == body
+
+
+def test_trim_partial_utf8_one_byte_body():
+    assert scraper._trim_partial_utf8(b"a") == b"a"
+    assert scraper._trim_partial_utf8("😀".encode()[:1]) == b""
+
+
+def test_truncate_keeps_short_text(monkeypatch):
+    monkeypatch.setattr(scraper, "MAX_TEXT_LENGTH", 10)
+    assert scraper._truncate("exactly 10") == "exactly 10"
+
+
+def test_truncate_backs_up_to_a_space(monkeypatch):
+    monkeypatch.setattr(scraper, "MAX_TEXT_LENGTH", 10)
+    assert scraper._truncate("hello world again") == "hello"
+
+
+def test_truncate_without_a_space_cuts_at_the_limit(monkeypatch):
+    monkeypatch.setattr(scraper, "MAX_TEXT_LENGTH", 10)
+    assert scraper._truncate("abcdefghijklmnop") == "abcdefghij"
+    # A space only at index 0 would leave nothing, so the hard cut is used
+    assert scraper._truncate(" bcdefghijklmnop") == " bcdefghij"